@@ -6,7 +6,7 @@ from tkinter import ttk, filedialog, messagebox
 from ttkthemes import ThemedTk
 from PIL import Image, ImageTk
 import numpy as np
-import os, threading, time
+import os, threading, time, math
 import serial
 import serial.tools.list_ports
 import glob
@@ -178,6 +178,66 @@ class CoolLEDController:
         
         return devices
 
+class StopSignal:
+    """threading.Event-like stop request with a precise timed wait.
+    
+    On Linux (Python 3.13+) wait() blocks in epoll on a CLOCK_MONOTONIC timerfd
+    plus an eventfd written by set(), giving ~10-50 us wake-up accuracy for
+    short pattern timings. Elsewhere it falls back to threading.Event.wait().
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._epoll = None
+        if sys.platform.startswith('linux') and hasattr(os, 'timerfd_create'):
+            import select
+            self._timer_fd = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK)
+            self._wake_fd = os.eventfd(0, os.EFD_NONBLOCK)
+            self._epoll = select.epoll()
+            self._epoll.register(self._timer_fd, select.EPOLLIN)
+            self._epoll.register(self._wake_fd, select.EPOLLIN | select.EPOLLET)
+    
+    def is_set(self):
+        return self._event.is_set()
+    
+    def set(self):
+        self._event.set()
+        if self._epoll is not None:
+            os.eventfd_write(self._wake_fd, 1)
+    
+    def clear(self):
+        self._event.clear()
+        if self._epoll is not None:
+            try:
+                os.eventfd_read(self._wake_fd)  # Drain pending wake-ups
+            except BlockingIOError:
+                pass
+    
+    def wait(self, timeout):
+        """Wait up to timeout seconds; returns True if stop was requested."""
+        if self._epoll is None:
+            return self._event.wait(timeout)
+        # Below 1 ns the timerfd value rounds to 0, which disarms the timer
+        if self._event.is_set() or timeout < 1e-9:
+            return self._event.is_set()
+        deadline = time.monotonic() + timeout
+        os.timerfd_settime(self._timer_fd, initial=timeout)
+        while not self._event.is_set():
+            # The timerfd normally wakes us; the poll timeout (1 ms resolution)
+            # is only a backstop so a timer that never fires cannot block forever
+            remaining = deadline - time.monotonic()
+            ready = [fd for fd, _ in self._epoll.poll(max(remaining, 0) + 0.001)]
+            if self._timer_fd in ready:
+                try:
+                    os.read(self._timer_fd, 8)  # Consume the expiration count
+                except BlockingIOError:
+                    pass
+                break
+            if not ready and time.monotonic() >= deadline:
+                break
+        os.timerfd_settime(self._timer_fd, initial=0)  # Disarm if interrupted
+        return self._event.is_set()
+
 class ImageItem:
     def __init__(self, filepath, mode='1bit'):
         self.filepath = filepath
@@ -219,15 +279,20 @@ class ImageItem:
             return  # Already loaded
         
         # Use cached PIL image if available, otherwise load just for thumbnail
+        # (the cached image is shared, so only that one needs copying first)
         if self._pil_image is not None:
-            img = self._pil_image
+            thumb = self._pil_image.copy()
         else:
-            img = Image.open(self.filepath)
-            if img.mode != 'L': img = img.convert('L')
+            thumb = Image.open(self.filepath)
         
         # Create thumbnail maintaining exact 16:9 aspect ratio (1920:1080)
-        thumb = img.copy()
-        thumb.thumbnail((480, 270), Image.LANCZOS)
+        # Preview only, so bilinear is good enough. L/RGB/RGBA shrink before
+        # converting to grayscale so the conversion runs on the small image;
+        # other modes convert first ('1'/'P' would otherwise be resampled
+        # nearest-neighbour and 16-bit modes can't be reduced at all)
+        if thumb.mode not in ('L', 'RGB', 'RGBA'): thumb = thumb.convert('L')
+        thumb.thumbnail((480, 270), Image.BILINEAR)
+        if thumb.mode != 'L': thumb = thumb.convert('L')
         self.thumbnail = ImageTk.PhotoImage(thumb)
         # Also create mirrored version
         thumb_mirrored = thumb.transpose(Image.FLIP_LEFT_RIGHT)
@@ -255,7 +320,7 @@ class DMDControllerGUI:
         self.demo_mode = False
         self.projecting = False
         self.projection_thread = None
-        self.stop_projection_flag = False
+        self._stop_event = StopSignal()  # Set to request projection stop
         self.images = []
         # CoolLED controller
         self.coolled = None
@@ -473,16 +538,9 @@ class DMDControllerGUI:
         except Exception as e:
             print(f"Could not save settings: {e}")
     
-    def _interruptable_sleep(self, duration_sec, interval=0.1):
-        """Sleep for a duration, but check stop_projection_flag every interval."""
-        start_sleep_time = time.time()
-        while time.time() - start_sleep_time < duration_sec:
-            if self.stop_projection_flag:
-                return True  # Interrupted
-            remaining_time = duration_sec - (time.time() - start_sleep_time)
-            if remaining_time <= 0: break
-            time.sleep(min(remaining_time, interval))
-        return False # Not interrupted
+    def _interruptable_sleep(self, duration_sec):
+        """Sleep for a duration, returning True as soon as a stop is requested."""
+        return self._stop_event.wait(max(0, duration_sec))
 
     def _save_black_frame_setting(self):
         """Save black frame setting when checkbox is toggled"""
@@ -960,6 +1018,11 @@ class DMDControllerGUI:
             if self.dlp.dev is None:
                 raise ConnectionError("DMD device not found. Please check USB connection.")
             
+            # Encode multi-image uploads in two worker processes (entry point is
+            # __main__-guarded), as many as can run ahead of the usb upload;
+            # single images and single-core machines encode on a thread
+            self.dlp.encode_processes = min(2, os.cpu_count() or 1)
+            
             self.dlp.stopsequence()
             self.dlp.changemode(3)
             self.connected = True
@@ -1441,7 +1504,7 @@ class DMDControllerGUI:
                 return
             
             # Calculate number of cycles
-            cycles = int(runtime_sec / cycle_duration)
+            cycles = max(1, math.floor(runtime_sec / cycle_duration))
             
             # Update display without triggering the other calculation
             if self.cycles_var.trace_vinfo():
@@ -1916,7 +1979,7 @@ class DMDControllerGUI:
         if skip_upload and not self.demo_mode:
             self.log_progress("Using pre-uploaded sequence (instant start!)")
         
-        self.stop_projection_flag = False
+        self._stop_event.clear()
         self.projecting = True
         self.update_button_states()
         self.proj_status_label.config(text="Projecting" if not self.demo_mode else "Simulating")
@@ -1970,7 +2033,7 @@ class DMDControllerGUI:
             self.projection_thread.start()
     
     def stop_projection(self):
-        self.stop_projection_flag = True
+        self._stop_event.set()
         if self.dlp and not self.demo_mode:
             self.dlp.stopsequence()
         
@@ -2148,7 +2211,7 @@ class DMDControllerGUI:
             total_displays = rep if rep != 0xFFFFFFFF else None  # None means infinite
             sequence_start_time = time.time()
             
-            while self.projecting and not self.stop_projection_flag:
+            while self.projecting and not self._stop_event.is_set():
                 # Check if we've reached the target number of displays (for finite sequences)
                 if total_displays is not None and idx >= total_displays:
                     self.log_progress("Sequence completed!")
@@ -2245,13 +2308,7 @@ class DMDControllerGUI:
                 if total_time:
                     # Wait for the full projection time in demo mode
                     self.log_progress(f"[DEMO] Projecting for {total_time:.1f}s...")
-                    start_time = time.time()
-                    while time.time() - start_time < total_time:
-                        if self.stop_projection_flag:
-                            break
-                        time.sleep(0.1)  # Check every 100ms
-                    
-                    if not self.stop_projection_flag:
+                    if not self._interruptable_sleep(total_time):
                         self.log_progress(f"[DEMO] Constant projection completed")
                         self.root.after(0, self.stop_projection)
                 else:
@@ -2283,14 +2340,8 @@ class DMDControllerGUI:
                 if total_time:
                     self.log_progress(f"Will auto-stop after {total_time:.1f}s")
                     
-                    # Wait for completion, checking stop flag periodically
-                    start_time = time.time()
-                    while time.time() - start_time < total_time:
-                        if self.stop_projection_flag:
-                            break
-                        time.sleep(0.1)  # Check every 100ms
-                    
-                    if not self.stop_projection_flag:
+                    # Wait for completion, returning early if stopped
+                    if not self._interruptable_sleep(total_time):
                         self.log_progress("Constant projection time completed")
                         self.root.after(0, self.stop_projection)
         except Exception as e:
@@ -2309,8 +2360,8 @@ class DMDControllerGUI:
             else:
                 runtime_sec = runtime_value
             
-            cycle_dur = sum(i.duration for i in self.images)
-            cycles = int(runtime_sec / cycle_dur) if cycle_dur > 0 else 1
+            cycle_dur = float(sum(i.duration for i in self.images))
+            cycles = max(1, math.floor(runtime_sec / cycle_dur)) if cycle_dur > 0 else 1
             
             if not self.demo_mode:
                 self.log_progress("Starting pulsed projection...")
@@ -2348,14 +2399,19 @@ class DMDControllerGUI:
             
             start_time = time.time()
             target_end_time = start_time + runtime_sec  # Target time for precise_total mode
+            log_prefix = '[DEMO] ' if self.demo_mode else ''
+            # Pattern currently loaded on the DMD; the array itself is kept so it is
+            # compared by identity and its id cannot be reused by a new array
+            armed_array = None
+            armed_settings = None
             
             for c in range(1, cycles + 1):
-                if self.stop_projection_flag: break
+                if self._stop_event.is_set(): break
                 
-                self.log_progress(f"{'[DEMO] ' if self.demo_mode else ''}Cycle {c}/{cycles}")
+                self.log_progress(f"{log_prefix}Cycle {c}/{cycles}")
                 
                 for idx, img in enumerate(self.images):
-                    if self.stop_projection_flag: break
+                    if self._stop_event.is_set(): break
                     
                     # Update preview to show current image
                     if img.led_enabled:
@@ -2423,14 +2479,20 @@ class DMDControllerGUI:
                             if self._interruptable_sleep(0.1): return  # Wait for all turn-off commands to complete
                         
                         # Step 3: Upload new DMD pattern (this takes time, especially for 8-bit)
+                        # Skipped if the DMD still holds this exact pattern from the previous
+                        # step - the pattern LUT survives stop/start
                         upload_start = time.time()
-                        # No progress callback for single image - faster upload in pulsed mode
-                        if img.mode == '1bit':
-                            self.dlp.defsequence([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0xFFFFFFFF,
-                                               progress_callback=None)
-                        else:
-                            self.dlp.defsequence_8bit([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0xFFFFFFFF,
-                                                     progress_callback=None)
+                        pattern_settings = (img.exposure, img.dark_time, img.mode)
+                        if img.image_array is not armed_array or pattern_settings != armed_settings:
+                            # No progress callback for single image - faster upload in pulsed mode
+                            if img.mode == '1bit':
+                                self.dlp.defsequence([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0xFFFFFFFF,
+                                                   progress_callback=None)
+                            else:
+                                self.dlp.defsequence_8bit([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0xFFFFFFFF,
+                                                         progress_callback=None)
+                            armed_array = img.image_array
+                            armed_settings = pattern_settings
                         upload_time = time.time() - upload_start
                         
                         # Step 4: Configure and turn on the target LED channels (still in dark period)
@@ -2556,7 +2618,7 @@ class DMDControllerGUI:
             next_path = self.settings['trigger_next_path']
             
             # Monitoring loop
-            while not self.stop_projection_flag:
+            while not self._stop_event.is_set():
                 try:
                     # Read trigger_on_off.txt
                     try:
@@ -2623,11 +2685,11 @@ class DMDControllerGUI:
                         self._project_single_pattern_nikon_trigger(current_pattern_index)
                     
                     # Small delay to avoid excessive file reading
-                    time.sleep(0.1)  # Check every 100ms
+                    self._interruptable_sleep(0.1)  # Check every 100ms
                     
                 except Exception as e:
                     self.log_progress(f"Warning: Error reading trigger files: {e}")
-                    time.sleep(0.5)  # Longer delay on error
+                    self._interruptable_sleep(0.5)  # Longer delay on error
             
             # Cleanup when stopped
             if not self.demo_mode:
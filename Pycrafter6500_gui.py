@@ -6,7 +6,7 @@ from tkinter import ttk, filedialog, messagebox
 from ttkthemes import ThemedTk
 from PIL import Image, ImageTk
 import numpy as np
-import os, threading, time
+import os, threading, time, math
 import pycrafter6500
 
 # DLPC900 Pattern On-The-Fly hardware limits
@@ -46,15 +46,20 @@ class ImageItem:
             return  # Already loaded
         
         # Use cached PIL image if available, otherwise load just for thumbnail
+        # (the cached image is shared, so only that one needs copying first)
         if self._pil_image is not None:
-            img = self._pil_image
+            thumb = self._pil_image.copy()
         else:
-            img = Image.open(self.filepath)
-            if img.mode != 'L': img = img.convert('L')
+            thumb = Image.open(self.filepath)
         
         # Create thumbnail maintaining exact 16:9 aspect ratio (1920:1080)
-        thumb = img.copy()
-        thumb.thumbnail((480, 270), Image.LANCZOS)
+        # Preview only, so bilinear is good enough. L/RGB/RGBA shrink before
+        # converting to grayscale so the conversion runs on the small image;
+        # other modes convert first ('1'/'P' would otherwise be resampled
+        # nearest-neighbour and 16-bit modes can't be reduced at all)
+        if thumb.mode not in ('L', 'RGB', 'RGBA'): thumb = thumb.convert('L')
+        thumb.thumbnail((480, 270), Image.BILINEAR)
+        if thumb.mode != 'L': thumb = thumb.convert('L')
         self.thumbnail = ImageTk.PhotoImage(thumb)
         # Also create mirrored version
         thumb_mirrored = thumb.transpose(Image.FLIP_LEFT_RIGHT)
@@ -82,7 +87,7 @@ class DMDControllerGUI:
         self.demo_mode = False
         self.projecting = False
         self.projection_thread = None
-        self.stop_projection_flag = False
+        self._stop_event = threading.Event()  # Set to request projection stop
         self.images = []
         self.selected_image_index = None
         self.projection_mode = tk.StringVar(value='constant')
@@ -453,6 +458,11 @@ class DMDControllerGUI:
             if self.dlp.dev is None:
                 raise ConnectionError("DMD device not found. Please check USB connection.")
             
+            # Encode multi-image uploads in two worker processes (entry point is
+            # __main__-guarded), as many as can run ahead of the usb upload;
+            # single images and single-core machines encode on a thread
+            self.dlp.encode_processes = min(2, os.cpu_count() or 1)
+            
             self.dlp.stopsequence()
             self.dlp.changemode(3)
             self.connected = True
@@ -745,7 +755,7 @@ class DMDControllerGUI:
                 return
             
             # Calculate number of cycles
-            cycles = int(runtime_sec / cycle_duration)
+            cycles = max(1, math.floor(runtime_sec / cycle_duration))
             
             # Update display without triggering the other calculation
             if self.cycles_var.trace_vinfo():
@@ -967,7 +977,7 @@ class DMDControllerGUI:
         if self.demo_mode:
             self.log_progress("[DEMO MODE] Simulating projection (no hardware output)")
         
-        self.stop_projection_flag = False
+        self._stop_event.clear()
         self.projecting = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
@@ -1019,7 +1029,7 @@ class DMDControllerGUI:
         self.projection_thread.start()
     
     def stop_projection(self):
-        self.stop_projection_flag = True
+        self._stop_event.set()
         if self.dlp and not self.demo_mode:
             self.dlp.stopsequence()
         self.projecting = False
@@ -1088,7 +1098,7 @@ class DMDControllerGUI:
             idx = 0
             total_displays = rep if rep != 0xFFFFFFFF else None  # None means infinite
             
-            while self.projecting and not self.stop_projection_flag:
+            while self.projecting and not self._stop_event.is_set():
                 # Check if we've reached the target number of displays (for finite sequences)
                 if total_displays is not None and idx >= total_displays:
                     self.log_progress("Sequence completed!")
@@ -1105,7 +1115,7 @@ class DMDControllerGUI:
                 
                 # Calculate time to display based on exposure + dark time (in seconds)
                 display_time = (img.exposure + img.dark_time) / 1000000.0  # Convert μs to seconds
-                time.sleep(display_time)
+                if self._stop_event.wait(display_time): return
                 idx += 1
                 
         except Exception as e:
@@ -1156,13 +1166,7 @@ class DMDControllerGUI:
                 if total_time:
                     # Wait for the full projection time in demo mode
                     self.log_progress(f"[DEMO] Projecting for {total_time:.1f}s...")
-                    start_time = time.time()
-                    while time.time() - start_time < total_time:
-                        if self.stop_projection_flag:
-                            break
-                        time.sleep(0.1)  # Check every 100ms
-                    
-                    if not self.stop_projection_flag:
+                    if not self._stop_event.wait(total_time):
                         self.log_progress(f"[DEMO] Constant projection completed")
                         self.root.after(0, self.stop_projection)
                 else:
@@ -1191,14 +1195,8 @@ class DMDControllerGUI:
                 if total_time:
                     self.log_progress(f"Will auto-stop after {total_time:.1f}s")
                     
-                    # Wait for completion, checking stop flag periodically
-                    start_time = time.time()
-                    while time.time() - start_time < total_time:
-                        if self.stop_projection_flag:
-                            break
-                        time.sleep(0.1)  # Check every 100ms
-                    
-                    if not self.stop_projection_flag:
+                    # Wait for completion, returning early if stopped
+                    if not self._stop_event.wait(total_time):
                         self.log_progress("Constant projection time completed")
                         self.root.after(0, self.stop_projection)
         except Exception as e:
@@ -1217,21 +1215,26 @@ class DMDControllerGUI:
             else:
                 runtime_sec = runtime_value
             
-            cycle_dur = sum(i.duration for i in self.images)
-            cycles = int(runtime_sec / cycle_dur) if cycle_dur > 0 else 1
+            cycle_dur = float(sum(i.duration for i in self.images))
+            cycles = max(1, math.floor(runtime_sec / cycle_dur)) if cycle_dur > 0 else 1
             
             self.log_progress("Starting pulsed projection..." if not self.demo_mode else "[DEMO] Starting pulsed projection simulation...")
             self.log_progress(f"Total cycles: {cycles}, Cycle duration: {cycle_dur}s")
             
             start_time = time.time()
+            log_prefix = '[DEMO] ' if self.demo_mode else ''
+            # Pattern currently loaded on the DMD; the array itself is kept so it is
+            # compared by identity and its id cannot be reused by a new array
+            armed_array = None
+            armed_settings = None
             
             for c in range(1, cycles + 1):
-                if self.stop_projection_flag: break
+                if self._stop_event.is_set(): break
                 
-                self.log_progress(f"{'[DEMO] ' if self.demo_mode else ''}Cycle {c}/{cycles}")
+                self.log_progress(f"{log_prefix}Cycle {c}/{cycles}")
                 
                 for idx, img in enumerate(self.images):
-                    if self.stop_projection_flag: break
+                    if self._stop_event.is_set(): break
                     
                     # Update preview to show current image
                     self.update_preview_during_projection(img, f"Projecting for {img.duration}s")
@@ -1241,20 +1244,25 @@ class DMDControllerGUI:
                     if self.demo_mode:
                         # Demo mode: simulate projection with full duration
                         self.log_progress(f"[DEMO] Projecting {filename} ({img.mode}) for {img.duration}s...")
-                        time.sleep(img.duration)  # Use full duration in demo mode
+                        if self._stop_event.wait(img.duration): return  # Use full duration in demo mode
                     else:
                         # Real hardware mode
                         self.log_progress(f"Projecting {filename} ({img.mode}) for {img.duration}s...")
                         
-                        # Setup sequence
-                        if img.mode == '1bit':
-                            self.dlp.defsequence([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0)
-                        else:
-                            self.dlp.defsequence_8bit([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0)
+                        # Setup sequence, unless the DMD still holds this exact pattern
+                        # from the previous step (the pattern LUT survives stop/start)
+                        pattern_settings = (img.exposure, img.dark_time, img.mode)
+                        if img.image_array is not armed_array or pattern_settings != armed_settings:
+                            if img.mode == '1bit':
+                                self.dlp.defsequence([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0)
+                            else:
+                                self.dlp.defsequence_8bit([img.image_array], [img.exposure], [False], [img.dark_time], [1], 0)
+                            armed_array = img.image_array
+                            armed_settings = pattern_settings
                         self.dlp.startsequence()
                         
-                        # Sleep for the projection duration
-                        time.sleep(img.duration)
+                        # Sleep for the projection duration (stop_projection halts the DMD)
+                        if self._stop_event.wait(img.duration): return
                         self.dlp.stopsequence()
                 
                 # Progress update
@@ -10,7 +10,8 @@ INSTRUCTIONS:
 2. Run this script: python determine_max_exposure.py
 3. Watch the DMD projection (NOT the console timing)
 4. For each test, note if the white pattern stays on for the FULL duration
-5. Script will identify your hardware's maximum working exposure time
+5. Script bisects the candidate list to identify your hardware's maximum
+   working exposure time in a few tests
 6. Update the constants in your code based on the results
 
 IMPORTANT: Watch the DMD screen, not the script timing!
@@ -21,6 +22,9 @@ import numpy as np
 import time
 import sys
 
+# Seconds of countdown before each projection (replaces a per-test Enter prompt)
+COUNTDOWN_SEC = 3
+
 def wait_for_user(prompt):
     """Wait for user to press Enter"""
     if sys.version_info[0] >= 3:
@@ -50,8 +54,9 @@ def test_exposure(dlp, exposure_us, test_image):
     print("\n*** GET READY TO WATCH THE DMD ***")
     print(f"The white pattern should stay on for {exposure_sec:.1f} seconds")
     print(f"If it disappears EARLIER, it FAILED")
-    print(f"Press Enter when ready...")
-    wait_for_user("")
+    for remaining in range(COUNTDOWN_SEC, 0, -1):
+        print(f"  Starting in {remaining}...")
+        time.sleep(1)
     
     print(f"\nStarting projection NOW! Watch the DMD for {exposure_sec:.1f} seconds...")
     dlp.startsequence()
@@ -105,8 +110,8 @@ def main():
     # Create test pattern (solid white)
     test_image = np.ones((1080, 1920), dtype=np.uint8)
     
-    # Test exposure times (in microseconds)
-    # Start low and work up to find the breaking point
+    # Test exposure times (in microseconds), sorted ascending
+    # Bisection finds the breaking point in ~log2(N) tests
     test_exposures = [
         1000000,    # 1 second (should always work)
         2000000,    # 2 seconds
@@ -120,33 +125,51 @@ def main():
     ]
     
     results = {}
-    max_working = 0
-    first_failing = None
     
     print("\n" + "="*70)
-    print("Starting systematic exposure time tests...")
+    print("Starting exposure time search (bisection)...")
     print("="*70)
     
-    for exposure_us in test_exposures:
+    def run_test(exposure_us):
+        """Run one test and record the result; returns None on hardware error"""
         try:
             worked = test_exposure(dlp, exposure_us, test_image)
-            results[exposure_us] = worked
-            
-            if worked:
-                max_working = exposure_us
-                print(f"✓ Result: {exposure_us/1000000:.1f}s exposure WORKS")
-            else:
-                print(f"✗ Result: {exposure_us/1000000:.1f}s exposure FAILED")
-                if first_failing is None:
-                    first_failing = exposure_us
-                # Stop testing once we find a failure
-                print("\nFound the breaking point! Stopping tests.")
-                break
-                
         except Exception as e:
             print(f"❌ Error during test: {e}")
             results[exposure_us] = False
+            return None
+        results[exposure_us] = worked
+        if worked:
+            print(f"✓ Result: {exposure_us/1000000:.1f}s exposure WORKS")
+        else:
+            print(f"✗ Result: {exposure_us/1000000:.1f}s exposure FAILED")
+        return worked
+    
+    # Bisect over the sorted candidates: assumes an exposure that works also
+    # works for all shorter ones, and one that fails also fails for all longer
+    # ones. lo is the longest exposure assumed to work, hi the longest candidate
+    # not yet ruled out.
+    lo, hi = 0, len(test_exposures) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        worked = run_test(test_exposures[mid])
+        if worked is None:
             break
+        if worked:
+            lo = mid
+        else:
+            hi = mid - 1
+    else:
+        # lo was only assumed to work if every probe failed - confirm it
+        if test_exposures[lo] not in results:
+            run_test(test_exposures[lo])
+    
+    print(f"\nSearch complete after {len(results)} test(s).")
+    
+    working = [exposure_us for exposure_us, worked in results.items() if worked]
+    failing = [exposure_us for exposure_us, worked in results.items() if not worked]
+    max_working = max(working) if working else 0
+    first_failing = min(failing) if failing else None
     
     # Print summary
     print("\n" + "="*70)
@@ -45,16 +45,12 @@ def merge(images):
     '''
     merge up to 24 binary images into a single 24-bit image, each pixel is an uint32 of format 0x00BBGGRR
     '''
+    # pack the bit planes along the image axis: byte i of each pixel holds
+    # images 8i..8i+7, image 8i+j in bit j
+    planes = np.packbits(np.asarray(images, dtype=bool), axis=0, bitorder='little')
     image32 = np.zeros((1080, 1920), dtype=np.uint32)
-    n_img = len(images)
-    batches = [8]*(n_img//8)
-    if n_img % 8:
-        batches.append(n_img % 8)
-    for i, batch_size in enumerate(batches):
-        image8 = np.zeros((1080, 1920), dtype=np.uint8)
-        for j in range(batch_size):
-            image8 += images[i*8+j]*(1 << j)
-        image32 += image8*(1 << (i*8))
+    for i, image8 in enumerate(planes):
+        image32 |= image8.astype(np.uint32) << (8*i)
     return image32
 
 
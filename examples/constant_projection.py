@@ -17,20 +17,36 @@ print("Loading 8-bit grayscale image...")
 # Get the absolute path to the images folder
 script_dir = os.path.dirname(os.path.abspath(__file__))
 image_path = os.path.join(script_dir, "..", "images", "hhu.tif")
-img = Image.open(image_path)
-
-# Convert to grayscale if needed and ensure it's 8-bit
-if img.mode != 'L':
-    img = img.convert('L')
-
-# Convert to numpy array
-img_array = np.array(img, dtype=np.uint8)
-
-# Resize to DMD resolution if needed (1920x1080)
-if img_array.shape != (1080, 1920):
-    print(f"Resizing image from {img_array.shape} to (1080, 1920)...")
-    img = img.resize((1920, 1080), Image.LANCZOS)
-    img_array = np.array(img, dtype=np.uint8)
+# Reuse the decoded + resized array from a previous run if the source
+# image has not changed since the cache was written
+cache_path = image_path + '.1080x1920.uint8.npy'
+if os.path.exists(cache_path) and os.path.getmtime(image_path) <= os.path.getmtime(cache_path):
+    print(f"Using cached array: {cache_path}")
+    img_array = np.load(cache_path, mmap_mode='r')
+else:
+    img = Image.open(image_path)
+
+    # Convert to grayscale if needed and ensure it's 8-bit
+    if img.mode != 'L':
+        img = img.convert('L')
+
+    # Resize to DMD resolution if needed (1920x1080)
+    # Done on the PIL image so the numpy array is only built once
+    if img.size != (1920, 1080):
+        print(f"Resizing image from {img.size[::-1]} to (1080, 1920)...")
+        img = img.resize((1920, 1080), Image.LANCZOS)
+
+    # Convert to numpy array ('L' mode is already uint8, so no extra cast)
+    img_array = np.array(img)
+    if img_array.dtype != np.uint8:
+        img_array = img_array.astype(np.uint8, copy=False)
+    if not img_array.flags.c_contiguous:
+        img_array = np.ascontiguousarray(img_array)
+
+    try:
+        np.save(cache_path, img_array)
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
 
 print(f"Image shape: {img_array.shape}")
 print(f"Image dtype: {img_array.dtype}")
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 import pycrafter6500
 import numpy
 import PIL.Image
+import math
 import time
 
 # ============================================================================
@@ -38,28 +39,44 @@ def load_and_convert_image(image_path, mode='1bit'):
     """
     print(f"Loading {image_path} in {mode} mode...")
     
-    # Load image
-    img = PIL.Image.open(image_path)
-    
-    # Convert to grayscale if needed
-    if img.mode != 'L':
-        img = img.convert('L')
-    
-    # Resize to DMD resolution if needed
-    if img.size != (1920, 1080):
-        print(f"  Resizing from {img.size} to (1920, 1080)...")
-        img = img.resize((1920, 1080), PIL.Image.LANCZOS)
-    
-    # Convert to numpy array
-    image = numpy.array(img)
+    # Reuse the decoded + resized grayscale array from a previous run if the
+    # source image has not changed since the cache was written
+    cache_path = image_path + '.1080x1920.uint8.npy'
+    if os.path.exists(cache_path) and os.path.getmtime(image_path) <= os.path.getmtime(cache_path):
+        print(f"  Using cached array: {cache_path}")
+        image = numpy.load(cache_path, mmap_mode='r')
+    else:
+        # Load image
+        img = PIL.Image.open(image_path)
+        
+        # Convert to grayscale if needed
+        if img.mode != 'L':
+            img = img.convert('L')
+        
+        # Resize to DMD resolution if needed
+        if img.size != (1920, 1080):
+            print(f"  Resizing from {img.size} to (1920, 1080)...")
+            img = img.resize((1920, 1080), PIL.Image.LANCZOS)
+        
+        # Convert to numpy array
+        image = numpy.array(img)
+        
+        try:
+            numpy.save(cache_path, image)
+        except OSError as e:
+            print(f"  Could not write cache {cache_path}: {e}")
     
     if mode == '1bit':
         # Convert to binary (0 or 1)
         image = image // 129
         print(f"  Converted to 1-bit binary (values: {image.min()}-{image.max()})")
     elif mode == '8bit':
-        # Keep as 8-bit grayscale (0-255)
-        image = image.astype(numpy.uint8)
+        # Keep as 8-bit grayscale (0-255); 'L' images are already uint8,
+        # so only convert/copy when actually needed
+        if image.dtype != numpy.uint8:
+            image = image.astype(numpy.uint8, copy=False)
+        if not image.flags.c_contiguous:
+            image = numpy.ascontiguousarray(image)
         print(f"  Loaded as 8-bit grayscale (values: {image.min()}-{image.max()})")
     else:
         raise ValueError(f"Invalid mode: {mode}. Use '1bit' or '8bit'")
@@ -106,7 +123,9 @@ def project_image(dlp, image, duration_seconds, mode='1bit'):
 def main():
     cycle_duration_sec = IMAGE1_DURATION_SEC + IMAGE2_DURATION_SEC
     total_runtime_sec = TOTAL_RUNTIME_MIN * 60
-    total_cycles = int(total_runtime_sec / cycle_duration_sec)
+    if cycle_duration_sec <= 0:
+        raise ValueError("IMAGE1_DURATION_SEC + IMAGE2_DURATION_SEC must be positive")
+    total_cycles = max(1, math.floor(total_runtime_sec / cycle_duration_sec))
     
     print("=" * 60)
     print("Timed Alternating Image Projection (8-bit Support)")
@@ -6,75 +6,114 @@ import numpy as np
 from PIL import Image, ImageDraw
 import os
 import math
+from functools import partial
+from multiprocessing import Pool
 
 # DMD resolution
 WIDTH = 1920
 HEIGHT = 1080
 NUM_FRAMES = 24
 
-# Create output directory
-output_dir = os.path.join(os.path.dirname(__file__), 'images', 'sequence')
-os.makedirs(output_dir, exist_ok=True)
-
-print(f"Generating {NUM_FRAMES} flipbook frames...")
-print(f"Output directory: {output_dir}")
-
 # Center point
 cx, cy = WIDTH // 2, HEIGHT // 2
 
-for frame in range(NUM_FRAMES):
-    # Create black background (0 = black)
-    img = Image.new('L', (WIDTH, HEIGHT), 0)
+# Precompute per-frame trig tables (full 360° rotation)
+angles = np.arange(NUM_FRAMES) / NUM_FRAMES * 2 * np.pi
+cos_a, sin_a = np.cos(angles), np.sin(angles)
+
+# Pattern 1: Rotating line endpoints, using the diagonal distance to reach corners
+line_length = int(math.sqrt(WIDTH**2 + HEIGHT**2) / 2)  # ~1100px
+end_x = cx + (line_length * cos_a).astype(int)
+end_y = cy + (line_length * sin_a).astype(int)
+
+# Pattern 2: Expanding and contracting circle radius per frame
+# Use most of the vertical space (500px radius at max)
+radius_variation = sin_a * 250 + 350  # Range: 100-600px
+
+# Pattern 3: Secondary circle centers orbiting farther out
+# 90° offset: cos(a + pi/2) = -sin(a), sin(a + pi/2) = cos(a)
+orbit_distance = 550  # Larger orbit
+small_cx = cx + (orbit_distance * -sin_a).astype(int)
+small_cy = cy + (orbit_distance * cos_a).astype(int)
+
+# Distance of every pixel from the center, shared by all frames
+yy, xx = np.ogrid[:HEIGHT, :WIDTH]
+dist = np.hypot(xx - cx, yy - cy).astype(np.float32)
+
+# Rasterized mask for the filled orbiting circle, stamped at a new offset each frame
+small_radius = 100  # Larger circle
+sy, sx = np.ogrid[-small_radius:small_radius + 1, -small_radius:small_radius + 1]
+small_disk = np.hypot(sx, sy) <= small_radius
+
+
+# Frame buffer and canvas reused for every frame rendered by this process
+frame_buf = np.empty((HEIGHT, WIDTH), dtype=np.uint8)
+frame_img = Image.new('1', (WIDTH, HEIGHT))
+
+
+def stamp(buf, mask, x0, y0):
+    """Set buf to 255 where mask is True, with mask's top-left at (x0, y0), clipped to buf."""
+    h, w = mask.shape
+    top, left = max(y0, 0), max(x0, 0)
+    bottom, right = min(y0 + h, buf.shape[0]), min(x0 + w, buf.shape[1])
+    if top >= bottom or left >= right:
+        return
+    buf[top:bottom, left:right][mask[top - y0:bottom - y0, left - x0:right - x0]] = 255
+
+
+def render_frame(frame, output_dir):
+    """Render and save one frame (runs in a worker process); returns its filename."""
+    # Reset to black background (0 = black)
+    frame_buf.fill(0)
+
+    # Pattern 2: Large expanding and contracting circle (8px outline)
+    r = radius_variation[frame]
+    frame_buf[(dist <= r) & (dist > r - 8)] = 255
+
+    # Pattern 3: Larger moving secondary circle orbiting farther out
+    stamp(frame_buf, small_disk, small_cx[frame] - small_radius, small_cy[frame] - small_radius)
+
+    # Pack 8 pixels per byte into the 1-bit canvas; line and text stay on PIL,
+    # drawn directly in 1-bit mode on top of the rasterized circles
+    img = frame_img
+    img.frombytes(np.packbits(frame_buf, axis=1))
     draw = ImageDraw.Draw(img)
-    
-    # Calculate rotation angle (full 360° rotation)
-    angle = (frame / NUM_FRAMES) * 2 * math.pi
-    
+
     # Pattern 1: Rotating line from center extending to screen edges
-    # Use diagonal distance to reach corners
-    line_length = int(math.sqrt(WIDTH**2 + HEIGHT**2) / 2)  # ~1100px
-    end_x = cx + int(line_length * math.cos(angle))
-    end_y = cy + int(line_length * math.sin(angle))
-    draw.line([(cx, cy), (end_x, end_y)], fill=255, width=12)
-    
-    # Pattern 2: Large expanding and contracting circle
-    # Use most of the vertical space (500px radius at max)
-    radius_variation = math.sin(angle) * 250 + 350  # Range: 100-600px
-    draw.ellipse([
-        cx - radius_variation, cy - radius_variation,
-        cx + radius_variation, cy + radius_variation
-    ], outline=255, width=8)
-    
-    # Pattern 3: Larger moving secondary circle orbiting farther out
-    offset_angle = angle + math.pi / 2  # 90° offset
-    orbit_distance = 550  # Larger orbit
-    small_radius = 100  # Larger circle
-    small_cx = cx + int(orbit_distance * math.cos(offset_angle))
-    small_cy = cy + int(orbit_distance * math.sin(offset_angle))
-    draw.ellipse([
-        small_cx - small_radius, small_cy - small_radius,
-        small_cx + small_radius, small_cy + small_radius
-    ], fill=255)
-    
+    draw.line([(cx, cy), (int(end_x[frame]), int(end_y[frame]))], fill=1, width=12)
+
     # Pattern 4: Frame number indicator (bottom corner to avoid overlap)
-    draw.text((WIDTH - 200, HEIGHT - 80), f"Frame {frame + 1:02d}/{NUM_FRAMES}", fill=255)
-    
-    # Convert to binary (0 or 1) for 1-bit mode
-    img_array = np.array(img)
-    binary_array = (img_array > 128).astype(np.uint8) * 255
-    
-    # Save as PNG
-    output_img = Image.fromarray(binary_array)
+    draw.text((WIDTH - 200, HEIGHT - 80), f"Frame {frame + 1:02d}/{NUM_FRAMES}", fill=1)
+
+    # Save as 1-bit PNG (light compression - encode speed matters more than file size)
     filename = f"frame_{frame+1:02d}.png"
     filepath = os.path.join(output_dir, filename)
-    output_img.save(filepath)
-    
-    print(f"  Generated: {filename}")
-
-print(f"\n✓ Successfully generated {NUM_FRAMES} frames!")
-print(f"  Location: {output_dir}")
-print(f"\nTo test in GUI:")
-print("  1. Launch gui.py")
-print("  2. Add all images from images/sequence/")
-print("  3. Select 'Sequence Mode'")
-print("  4. Start projection")
+    img.save(filepath, 'PNG', compress_level=1)
+
+    return filename
+
+
+def main():
+    # Create output directory
+    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images', 'sequence')
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Generating {NUM_FRAMES} flipbook frames...")
+    print(f"Output directory: {output_dir}")
+
+    # Frames are independent, render them in parallel
+    with Pool() as pool:
+        for filename in pool.imap(partial(render_frame, output_dir=output_dir), range(NUM_FRAMES)):
+            print(f"  Generated: {filename}")
+
+    print(f"\n✓ Successfully generated {NUM_FRAMES} frames!")
+    print(f"  Location: {output_dir}")
+    print(f"\nTo test in GUI:")
+    print("  1. Launch gui.py")
+    print("  2. Add all images from images/sequence/")
+    print("  3. Select 'Sequence Mode'")
+    print("  4. Start projection")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,15 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import math
 import shutil
+from functools import lru_cache, partial
+from multiprocessing import Pool
+
+# Optional faster PNG encoder (libspng) for the 8-bit frames, falls back to Pillow
+try:
+    import pyspng
+    PYSPNG_AVAILABLE = True
+except ImportError:
+    PYSPNG_AVAILABLE = False
 
 def create_directories():
     """Create output directories if they don't exist."""
@@ -36,94 +45,191 @@ def create_directories():
     
     return dirs
 
+@lru_cache(maxsize=None)
+def _load_font():
+    """Load the label font once per process, falling back to the default font."""
+    try:
+        return ImageFont.truetype("Arial.ttf", 40)
+    except IOError:
+        return _load_default_font()
+
+@lru_cache(maxsize=None)
+def _load_default_font():
+    """Load Pillow's built-in font once per process instead of once per frame."""
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=None)
+def _glyph_tile(font, char):
+    """Rasterize one character once per process.
+    
+    Returns (mask, offset, advance): an 'L' mask of the glyph's
+    ink box, its (x, y) offset from the text origin, and the pen advance.
+    """
+    left, top, right, bottom = font.getbbox(char)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), char, fill=255, font=font)
+    return mask, (left, top), font.getlength(char)
+
+def _text_length(text, font):
+    """Width of text as laid out by _paste_text, from the cached glyph advances."""
+    return sum(_glyph_tile(font, char)[2] for char in text)
+
+def _paste_text(img, xy, text, fill, font):
+    """Stamp text onto an 'L' img from cached glyph tiles instead of calling draw.text."""
+    x, y = xy
+    for char in text:
+        mask, (dx, dy), advance = _glyph_tile(font, char)
+        img.paste(fill, (round(x) + dx, round(y) + dy), mask)
+        x += advance
+
+@lru_cache(maxsize=None)
+def _scratch_image(mode, width, height):
+    """Per-process PIL image reused as the canvas for every frame."""
+    return Image.new(mode, (width, height))
+
+@lru_cache(maxsize=None)
+def _scratch_array(width, height):
+    """Per-process uint8 buffer reused for the vectorized 8-bit frame layers."""
+    return np.empty((height, width), dtype=np.uint8)
+
+@lru_cache(maxsize=None)
+def _ring_tile(circle_size):
+    """Concentric 2px rings every 5px out to circle_size, darker towards the edge.
+    
+    Returns (values, mask) arrays of shape (2*circle_size+1, 2*circle_size+1)
+    centered on the circle center; mask marks the ring pixels.
+    """
+    yy, xx = np.ogrid[-circle_size:circle_size + 1, -circle_size:circle_size + 1]
+    dist = np.hypot(xx, yy)
+    # Radius of the ring each pixel falls on (rings at circle_size, circle_size-5, ...)
+    ring_r = circle_size - np.floor((circle_size - dist + 0.5) / 5) * 5
+    mask = (dist > ring_r - 1.5) & (dist <= ring_r + 0.5) & (ring_r > 0) & (ring_r <= circle_size)
+    values = (255 * (1 - ring_r / circle_size)).clip(0, 255).astype(np.uint8)
+    return values, mask
+
+def _render_1bit(i, output_dir, width, height, num_patterns):
+    """Render and save 1-bit test pattern i (runs in a worker process)."""
+    # Calculate pattern parameters based on frame number
+    phase = (2 * math.pi * i) / 100  # Complete cycle every 100 frames
+    
+    # Draw a moving square
+    size = min(width, height) // 4
+    x = int((width - size) * (0.5 + 0.4 * math.sin(phase)))
+    y = int((height - size) * (0.5 + 0.4 * math.cos(phase)))
+    
+    # Build the frame as packed bits (8 pixels per byte, MSB first) on a white
+    # background; every row of the square clears the same bits, so one packed
+    # row is computed and slice-assigned over the square's rows
+    # (the rectangle is inclusive of x + size and y + size, as in PIL)
+    row = np.ones(width, dtype=bool)  # 1 = white in 1-bit mode
+    row[x:x + size + 1] = False
+    packed = _scratch_array((width + 7) // 8, height)
+    packed.fill(0xFF)
+    packed[y:y + size + 1] = np.packbits(row)
+    
+    # Load the packed bits into the reused canvas for the text overlay
+    img = _scratch_image('1', width, height)
+    img.frombytes(packed)
+    
+    # Add frame number; draw.text rather than _paste_text, since the small
+    # default font's 1-bit glyphs do not line up when stamped one at a time
+    draw = ImageDraw.Draw(img)
+    draw.text((10, 10), f"Frame {i+1}/{num_patterns}", fill=0, font=_load_default_font())
+    
+    # Save as 1-bit PNG; compress_level=1 since DEFLATE dominates generation
+    # time and these bilevel frames compress well even at the lowest level
+    filename = os.path.join(output_dir, f'pattern_{i:04d}.png')
+    img.save(filename, 'PNG', compress_level=1)
+
+def _render_8bit(i, output_dir, width, height, num_patterns, save_format='PNG'):
+    """Render and save 8-bit grayscale test pattern i (runs in a worker process)."""
+    font = _load_font()
+    
+    # Calculate pattern parameters based on frame number
+    phase = (2 * math.pi * i) / 25  # Complete cycle every 25 frames
+    
+    # Draw a gradient that moves across the screen
+    # The gradient is drawn in 5-pixel horizontal bands; each row takes the
+    # value of the band centered on the nearest multiple of 5. Rows past the
+    # last band keep the mid-gray (128) background.
+    band_y = (np.arange(height) + 2) // 5 * 5
+    column = (128 + 127 * np.sin(phase + band_y / 100)).astype(np.uint8)
+    column[band_y >= height] = 128  # 128 = mid-gray
+    background = _scratch_array(width, height)
+    background[:] = column[:, None]
+    
+    # Draw a rotating grayscale gradient circle, clipped to the frame
+    circle_size = min(width, height) // 3
+    ring_values, ring_mask = _ring_tile(circle_size)
+    center_x = int(width * (0.5 + 0.3 * math.sin(phase)))
+    center_y = int(height * (0.5 + 0.3 * math.cos(phase)))
+    top, bottom = max(center_y - circle_size, 0), min(center_y + circle_size + 1, height)
+    left, right = max(center_x - circle_size, 0), min(center_x + circle_size + 1, width)
+    tile = (slice(top - center_y + circle_size, bottom - center_y + circle_size),
+            slice(left - center_x + circle_size, right - center_x + circle_size))
+    mask = ring_mask[tile]
+    background[top:bottom, left:right][mask] = ring_values[tile][mask]
+    
+    # Copy into the reused grayscale canvas for the text overlay
+    img = _scratch_image('L', width, height)
+    img.frombytes(background)
+    
+    # Add frame number and intensity indicator
+    text = f"Frame {i+1}/{num_patterns}"
+    text_width = _text_length(text, font)
+    text_x = width - text_width - 20
+    text_y = height - 50
+    
+    # Draw text with outline for better visibility
+    for dx in [-1, 1]:
+        for dy in [-1, 1]:
+            _paste_text(img, (text_x + dx, text_y + dy), text, 0, font)
+    _paste_text(img, (text_x, text_y), text, 255, font)
+    
+    if save_format == 'JPEG':
+        # Lossy, but much faster to encode than PNG for these smooth gradients
+        filename = os.path.join(output_dir, f'grayscale_{i:04d}.jpg')
+        img.save(filename, 'JPEG', quality=90)
+        return
+    
+    # Save as 8-bit PNG (fast, light compression)
+    filename = os.path.join(output_dir, f'grayscale_{i:04d}.png')
+    if PYSPNG_AVAILABLE:
+        with open(filename, 'wb') as f:
+            f.write(pyspng.encode(np.asarray(img), compress_level=1))
+    else:
+        img.save(filename, 'PNG', compress_level=1)
+
 def generate_1bit_sequence(output_dir, width=1920, height=1080, num_patterns=400):
-    """Generate 1-bit test patterns."""
+    """Generate 1-bit test patterns, one frame per worker process task."""
     print(f"Generating {num_patterns} 1-bit patterns...")
     
-    for i in range(num_patterns):
-        # Create a new image with white background
-        img = Image.new('1', (width, height), color=1)  # 1 = white in 1-bit mode
-        draw = ImageDraw.Draw(img)
-        
-        # Calculate pattern parameters based on frame number
-        phase = (2 * math.pi * i) / 100  # Complete cycle every 100 frames
-        
-        # Draw a moving square
-        size = min(width, height) // 4
-        x = int((width - size) * (0.5 + 0.4 * math.sin(phase)))
-        y = int((height - size) * (0.5 + 0.4 * math.cos(phase)))
-        
-        # Draw the square (black on white)
-        draw.rectangle([x, y, x + size, y + size], fill=0)
-        
-        # Add frame number
-        draw.text((10, 10), f"Frame {i+1}/{num_patterns}", fill=0)
-        
-        # Save as 1-bit PNG
-        filename = os.path.join(output_dir, f'pattern_{i:04d}.png')
-        img.save(filename, 'PNG')
-        
-        if (i + 1) % 50 == 0:
-            print(f"  - Generated {i+1}/{num_patterns} patterns")
+    render = partial(_render_1bit, output_dir=output_dir, width=width,
+                     height=height, num_patterns=num_patterns)
+    with Pool() as pool:
+        # Frames are independent, so completion order does not matter
+        for done, _ in enumerate(pool.imap_unordered(render, range(num_patterns), chunksize=8), 1):
+            if done % 50 == 0:
+                print(f"  - Generated {done}/{num_patterns} patterns")
     
     print(f"1-bit patterns saved to: {output_dir}")
 
-def generate_8bit_sequence(output_dir, width=1920, height=1080, num_patterns=50):
-    """Generate 8-bit grayscale test patterns."""
+def generate_8bit_sequence(output_dir, width=1920, height=1080, num_patterns=50, save_format='PNG'):
+    """Generate 8-bit grayscale test patterns, one frame per worker process task.
+    
+    save_format is 'PNG' (lossless, default) or 'JPEG' (quality 90, faster to
+    write; only use it if whatever loads the patterns accepts .jpg files).
+    """
+    if save_format not in ('PNG', 'JPEG'):
+        raise ValueError(f"save_format must be 'PNG' or 'JPEG', got {save_format!r}")
     print(f"\nGenerating {num_patterns} 8-bit grayscale patterns...")
     
-    # Try to load a font, fall back to default if not available
-    try:
-        font = ImageFont.truetype("Arial.ttf", 40)
-    except IOError:
-        font = ImageFont.load_default()
-    
-    for i in range(num_patterns):
-        # Create a new grayscale image
-        img = Image.new('L', (width, height), color=128)  # 128 = mid-gray
-        draw = ImageDraw.Draw(img)
-        
-        # Calculate pattern parameters based on frame number
-        phase = (2 * math.pi * i) / 25  # Complete cycle every 25 frames
-        
-        # Draw a gradient that moves across the screen
-        for y in range(0, height, 5):
-            # Vary the gradient based on the frame number and y position
-            intensity = int(128 + 127 * math.sin(phase + y/100))
-            draw.line([(0, y), (width, y)], fill=intensity, width=5)
-        
-        # Draw a rotating grayscale gradient circle
-        circle_size = min(width, height) // 3
-        for r in range(circle_size, 0, -5):
-            intensity = int(255 * (1 - r/circle_size))
-            center_x = int(width * (0.5 + 0.3 * math.sin(phase)))
-            center_y = int(height * (0.5 + 0.3 * math.cos(phase)))
-            bounds = [
-                center_x - r, 
-                center_y - r, 
-                center_x + r, 
-                center_y + r
-            ]
-            draw.ellipse(bounds, outline=intensity, width=2)
-        
-        # Add frame number and intensity indicator
-        text = f"Frame {i+1}/{num_patterns}"
-        text_width = draw.textlength(text, font=font)
-        text_x = width - text_width - 20
-        text_y = height - 50
-        
-        # Draw text with outline for better visibility
-        for dx in [-1, 1]:
-            for dy in [-1, 1]:
-                draw.text((text_x + dx, text_y + dy), text, fill=0, font=font)
-        draw.text((text_x, text_y), text, fill=255, font=font)
-        
-        # Save as 8-bit PNG
-        filename = os.path.join(output_dir, f'grayscale_{i:04d}.png')
-        img.save(filename, 'PNG')
-        
-        if (i + 1) % 10 == 0:
-            print(f"  - Generated {i+1}/{num_patterns} patterns")
+    render = partial(_render_8bit, output_dir=output_dir, width=width,
+                     height=height, num_patterns=num_patterns, save_format=save_format)
+    with Pool() as pool:
+        for done, _ in enumerate(pool.imap_unordered(render, range(num_patterns), chunksize=2), 1):
+            if done % 10 == 0:
+                print(f"  - Generated {done}/{num_patterns} patterns")
     
     print(f"8-bit grayscale patterns saved to: {output_dir}")
 
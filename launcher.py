@@ -5,8 +5,6 @@ Simple application selector for CoolCrafter suite
 """
 import tkinter as tk
 from tkinter import ttk
-from ttkthemes import ThemedTk
-import subprocess
 import sys
 import os
 
@@ -129,10 +127,13 @@ class LauncherApp:
     
     def launch_app(self, app):
         """Launch the selected application or open URL and close launcher"""
+        # Imported here so they don't add to launcher start-up time
+        import subprocess
+        import webbrowser
+        
         try:
             if 'url' in app:
                 # Open URL in default web browser
-                import webbrowser
                 webbrowser.open(app['url'])
             else:
                 # Get the directory where launcher.py is located
@@ -176,7 +177,9 @@ class LauncherApp:
             ).pack()
 
 def main():
-    root = ThemedTk(theme="arc")
+    root = tk.Tk()
+    # Built-in ttk theme, close to the 'arc' look without loading ttkthemes
+    ttk.Style(root).theme_use('clam')
     app = LauncherApp(root)
     root.mainloop()
 
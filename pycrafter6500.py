@@ -7,37 +7,56 @@
 import usb.core
 import usb.util
 import numpy
+import struct
+import time
 
 # DLPC900 Pattern On-The-Fly mode hardware limitation
 # Test your hardware with determine_max_exposure.py to find your limits
 MAX_SAFE_EXPOSURE_US = 5000000  # 5 seconds - hardware maximum (test your hardware!)
 MAX_RECOMMENDED_EXPOSURE_US = 3000000  # 3 seconds - recommended safe limit
 import sys
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from erle import encode, encode_8bit
 
+# Pattern display lut entry (usb command 0x1a34), little endian: pattern index,
+# 24-bit exposure (low 16 bits, high 8 bits), options byte, 24-bit dark time,
+# trigger out byte, then pattern set index and bit position. The 24-bit fields
+# are split so struct range checks still reject values that don't fit.
+_pattern_struct=struct.Struct('<HHBBHBBH')
+
+# Most images encoded ahead of the upload at any time, which also caps the
+# number of encoder processes
+_max_encode_ahead=2
+
+
+##function that validates the per-pattern settings of a whole sequence at once,
+##before anything is sent to the dmd, and returns them as lists of plain ints
+
+def _integer_values(name,values,allow_bool=False):
+    # No dtype is forced, so floats and strings are not silently truncated or
+    # parsed; ints too large for numpy come back as an object array
+    values=numpy.asarray(values)
+    if values.size and not (numpy.issubdtype(values.dtype,numpy.integer) or
+                            (allow_bool and values.dtype==numpy.bool_)):
+        raise ValueError(f"{name} values must be integers")
+    return values
+
+def _pattern_settings(exp,ti,dt,to):
+    exp=_integer_values('Exposure time',exp)
+    ti=_integer_values('Trigger in',ti,allow_bool=True)
+    dt=_integer_values('Dark time',dt)
+    to=_integer_values('Trigger out',to)
+    for name,values,limit in (('Exposure time',exp,0xffffff),
+                              ('Dark time',dt,0xffffff),
+                              ('Trigger out',to,0xff)):
+        if values.size and (values.min()<0 or values.max()>limit):
+            raise ValueError(f"{name} values must be between 0 and {limit}")
+    return exp.tolist(),[bool(t) for t in ti.tolist()],dt.tolist(),to.tolist()
 
-##function that converts a number into a bit string of given length
-
-def convlen(a,l):
-    b=bin(a)[2:]
-    padding=l-len(b)
-    b='0'*padding+b
-
-    return b
-
-##function that converts a bit string into a given number of bytes
-
-def bitstobytes(a):
-    bytelist=[]
-    if len(a)%8!=0:
-        padding=8-len(a)%8
-        a='0'*padding+a
-    for i in range(len(a)//8):
-        bytelist.append(int(a[8*i:8*(i+1)],2))
-
-    bytelist.reverse()
-
-    return bytelist
 
 ##a dmd controller class
 
@@ -48,71 +67,88 @@ class dmd():
         self.dev.set_configuration()
 
         self.ans=[]
+
+        # Set while defining a sequence: definepattern and setbmp then skip
+        # their per-call error check and the caller checks once afterwards
+        self._defer_errors = False
+
+        # Number of worker processes used to ERLE encode patterns in
+        # defsequence/defsequence_8bit (at most _max_encode_ahead are used).
+        # 0 or 1 encodes on a single background thread. More workers encode
+        # several batches in parallel; the pool is started on first use and
+        # kept for later sequences. Workers are spawned, so the calling script
+        # must guard its entry point with `if __name__ == "__main__":`
+        self.encode_processes = 0
+        self._encode_pool = None
         
         # USB timeout in milliseconds (60 seconds for large 8-bit uploads)
         # Default is usually 1000ms (1 sec) which is too short for large patterns
         # 60s is needed because DMD needs time to process large compressed images
         self.usb_timeout = 60000
-
-## standard usb command function
-
-    def command(self,mode,sequencebyte,com1,com2,data=None):
-        buffer = []
-
-        flagstring=''
-        if mode=='r':
-            flagstring+='1'
-        else:
-            flagstring+='0'        
-        flagstring+='1000000'
-        buffer.append(bitstobytes(flagstring)[0])
-        buffer.append(sequencebyte)
-        temp=bitstobytes(convlen(len(data)+2,16))
-        buffer.append(temp[0])
-        buffer.append(temp[1])
-        buffer.append(com2)
-        buffer.append(com1)
-
-        if len(buffer)+len(data)<65:
         
-            for i in range(len(data)):
-                buffer.append(data[i])
-
-            for i in range(64-len(buffer)):
-                buffer.append(0x00)
-
-
-            self.dev.write(1, buffer, self.usb_timeout)
-
+        # Seconds to wait after the last packet of an image upload. The DMD
+        # does not answer while it processes the image, so bmpload can't poll
+        # for completion. Lower this if your hardware finishes sooner
+        self.upload_settle_time = 2.0
+
+## yields encode_fn(job) for each job in order while the caller uploads the
+## previous result. Only as many jobs as there are encoder workers run ahead
+## of the upload, so encoded images don't pile up waiting for the usb link
+
+    def _encode_ahead(self, encode_fn, jobs):
+        # Single images (pulsed/constant projection) stay on a thread, a worker
+        # process would only add start-up and pickling cost
+        if self.encode_processes > 1 and len(jobs) > 1:
+            if self._encode_pool is None:
+                self._encode_pool = ProcessPoolExecutor(
+                    max_workers=min(self.encode_processes, _max_encode_ahead),
+                    mp_context=multiprocessing.get_context('spawn'))
+            encoder = self._encode_pool
+            lookahead = _max_encode_ahead
         else:
-            for i in range(64-len(buffer)):
-                buffer.append(data[i])
+            encoder = ThreadPoolExecutor(max_workers=1)
+            lookahead = 1
+        jobs = iter(jobs)
+        pending = deque()
+        try:
+            for job in islice(jobs, lookahead):
+                pending.append(encoder.submit(encode_fn, job))
+            while pending:
+                result = pending.popleft().result()
+                # Start on the next job before handing this result over
+                for job in islice(jobs, 1):
+                    pending.append(encoder.submit(encode_fn, job))
+                yield result
+                del result  # the caller has uploaded it, let it be freed
+        except BrokenProcessPool:
+            # A worker died: drop the pool so the next sequence starts a new one
+            if encoder is self._encode_pool:
+                self._encode_pool = None
+                encoder.shutdown(wait=False)
+            raise
+        finally:
+            # Don't keep encoding images that will not be uploaded after an error
+            for future in pending:
+                future.cancel()
+            if encoder is not self._encode_pool:
+                encoder.shutdown(wait=False)
 
-            self.dev.write(1, buffer, self.usb_timeout)
-
-            buffer = []
-
-            j=0
-            while j<len(data)-58:
-                buffer.append(data[j+58])
-                j=j+1
-                if j%64==0:
-                    self.dev.write(1, buffer, self.usb_timeout)
-
-                    buffer = []
-
-            if j%64!=0:
-
-                while j%64!=0:
-                    buffer.append(0x00)
-                    j=j+1
-
-
-                self.dev.write(1, buffer, self.usb_timeout)                
-                
+## standard usb command function
 
+    def command(self,mode,sequencebyte,com1,com2,data=None):
+        # Report layout: flag byte, sequence byte, 2-byte little endian length,
+        # 2-byte usb command, then data. The stream is zero padded to a whole
+        # number of 64-byte hid reports and handed to libusb in a single
+        # write, which splits it into 64-byte interrupt packets for the device.
+        total=6+len(data)
+        nbytes=max(64,(total+63)//64*64)
+        buffer=bytearray(nbytes)
 
+        flagbyte=0xc0 if mode=='r' else 0x40
+        struct.pack_into('<BBHBB',buffer,0,flagbyte,sequencebyte,len(data)+2,com2,com1)
+        buffer[6:total]=data
 
+        self.dev.write(1, buffer, self.usb_timeout)
 
         self.ans=self.dev.read(0x81, 64, self.usb_timeout)
 
@@ -132,8 +168,7 @@ class dmd():
 ## function printing all of the dlp answer
 
     def readreply(self):
-        for i in self.ans:
-            print (hex(i))
+        print('\n'.join(hex(i) for i in self.ans))
 
 ## functions for idle mode activation
 
@@ -177,8 +212,6 @@ class dmd():
 
     def startsequence(self):
         """Start DMD pattern sequence playback"""
-        import time
-        
         # Set Input Source to Streaming (required for Pattern OTF)
         self.command('w',0x00,0x1a,0x22,[0x00])
         self.checkforerrors()
@@ -197,88 +230,48 @@ class dmd():
 
     def stopsequence(self):
         """Stop DMD pattern sequence playback"""
-        import time
         self.command('w',0x00,0x1a,0x24,[0])
         self.checkforerrors()
         time.sleep(0.15)  # Wait for DMD to clear buffers
 
 
     def configurelut(self,imgnum,repeatnum):
-        img=convlen(imgnum,11)
-        repeat=convlen(repeatnum,32)
-
-        string=repeat+'00000'+img
-
-        bytes=bitstobytes(string)
+        # 11-bit number of lut entries (upper 5 bits zero), then 32-bit repeat count
+        payload=struct.pack('<HI',imgnum&0x7ff,repeatnum)
 
         # Configure LUT (no validation needed per DLPC900 reference implementations)
-        self.command('w',0x00,0x1a,0x31,bytes)
+        self.command('w',0x00,0x1a,0x31,payload)
         self.checkforerrors()
         
 
     def definepattern(self,index,exposure,bitdepth,color,triggerin,darktime,triggerout,patind,bitpos):
-        payload=[]
-        index=convlen(index,16)
-        index=bitstobytes(index)
-        for i in range(len(index)):
-            payload.append(index[i])
-
-        exposure=convlen(exposure,24)
-        exposure=bitstobytes(exposure)
-        for i in range(len(exposure)):
-            payload.append(exposure[i])
-        optionsbyte=''
-        optionsbyte+='1'
-        bitdepth=convlen(bitdepth-1,3)
-        optionsbyte=bitdepth+optionsbyte
-        optionsbyte=color+optionsbyte
-        if triggerin:
-            optionsbyte='1'+optionsbyte
-        else:
-            optionsbyte='0'+optionsbyte
-
-        payload.append(bitstobytes(optionsbyte)[0])
-
-        darktime=convlen(darktime,24)
-        darktime=bitstobytes(darktime)
-        for i in range(len(darktime)):
-            payload.append(darktime[i])
-
-        triggerout=convlen(triggerout,8)
-        triggerout=bitstobytes(triggerout)
-        payload.append(triggerout[0])
-
-        patind=convlen(patind,11)
-        bitpos=convlen(bitpos,5)
-        lastbits=bitpos+patind
-        lastbits=bitstobytes(lastbits)
-        for i in range(len(lastbits)):
-            payload.append(lastbits[i])
+        # options byte: bit 0 clear pattern, bits 1-3 bit depth - 1,
+        # bits 4-6 color (bit string, e.g. '111' = white), bit 7 trigger in
+        optionsbyte=1|((bitdepth-1)<<1)|(int(color,2)<<4)|(int(bool(triggerin))<<7)
 
+        # 11-bit pattern set index, bit position in the top 5 bits
+        lastbits=(bitpos<<11)|patind
 
+        payload=_pattern_struct.pack(index,
+                                     exposure&0xffff,exposure>>16,
+                                     optionsbyte,
+                                     darktime&0xffff,darktime>>16,
+                                     triggerout,
+                                     lastbits)
 
         self.command('w',0x00,0x1a,0x34,payload)
-        self.checkforerrors()
+        if not self._defer_errors:
+            self.checkforerrors()
         
 
 
     def setbmp(self,index,size):
-        payload=[]
-
-        index=convlen(index,5)
-        index='0'*11+index
-        index=bitstobytes(index)
-        for i in range(len(index)):
-            payload.append(index[i]) 
-
-
-        total=convlen(size,32)
-        total=bitstobytes(total)
-        for i in range(len(total)):
-            payload.append(total[i])         
+        # 16-bit image index, then 32-bit compressed image size
+        payload=struct.pack('<HI',index,size)
         
         self.command('w',0x00,0x1a,0x2a,payload)
-        self.checkforerrors()
+        if not self._defer_errors:
+            self.checkforerrors()
 
 ## bmp loading function, divided in 56 bytes packages
 ## max  hid package size=64, flag bytes=4, usb command bytes=2
@@ -293,35 +286,34 @@ class dmd():
             progress_msg: Optional message prefix for progress updates
             progress_callback: Optional callback function(message) for GUI updates
         """
+        report = progress_callback or print
         packnum = size // 504 + 1
         counter = 0
+        data = memoryview(image)  # slices below copy straight from the encoded buffer
         
         # Progress reporting every 10% or every 50 packets (whichever is more frequent)
         report_interval = max(1, min(50, packnum // 10))
         
+        # 2-byte length prefix: full packets carry 504 bytes, the last one the rest
+        full_prefix = (504).to_bytes(2, 'little')
+        tail_prefix = (size % 504).to_bytes(2, 'little')
+        
         for i in range(packnum):
             # Progress feedback
             if i % report_interval == 0 or i == packnum - 1:
                 percent = int((i + 1) * 100 / packnum)
-                msg = f"  {progress_msg}Progress: {percent}% ({i+1}/{packnum} packets)"
-                if progress_callback:
-                    progress_callback(msg)
-                else:
-                    print(msg)
+                report(f"  {progress_msg}Progress: {percent}% ({i+1}/{packnum} packets)")
             
-            payload = []
             if i < packnum - 1:
-                leng = convlen(504, 16)
+                leng = full_prefix
                 bits = 504
             else:
-                leng = convlen(size % 504, 16)
+                leng = tail_prefix
                 bits = size % 504
-            leng = bitstobytes(leng)
-            for j in range(2):
-                payload.append(leng[j])
-            for j in range(bits):
-                payload.append(image[counter])
-                counter += 1
+            payload = bytearray(2 + bits)
+            payload[:2] = leng
+            payload[2:] = data[counter:counter + bits]
+            counter += bits
             
             try:
                 self.command('w', 0x11, 0x1a, 0x2b, payload)
@@ -331,15 +323,10 @@ class dmd():
                     self.checkforerrors()
                 else:
                     # Last packet - give DMD time to process without checking
-                    import time
-                    time.sleep(2.0)
+                    time.sleep(self.upload_settle_time)
                     
             except Exception as e:
-                msg = f"  ERROR at packet {i+1}/{packnum}: {e}"
-                if progress_callback:
-                    progress_callback(msg)
-                else:
-                    print(msg)
+                report(f"  ERROR at packet {i+1}/{packnum}: {e}")
                 raise
 
 
@@ -364,8 +351,9 @@ class dmd():
             raise ValueError("Maximum number of 1-bit patterns (400) exceeded")
         if not all(len(lst) == len(images) for lst in [exp, ti, dt, to]):
             raise ValueError("All input lists must have the same length as images list")
+        exp, ti, dt, to = _pattern_settings(exp, ti, dt, to)
         
-        import time
+        report = progress_callback or print
         
         # Required sequence for mode change (per DLPC900 reference implementations):
         # Stop → Set Pattern OTF mode → Stop again
@@ -382,74 +370,61 @@ class dmd():
         time.sleep(0.05)
 
         num = len(images)
-        encodedimages = []
-        sizes = []
         batch_size = 24  # Number of patterns per batch
-
-        # Step 1: Encode all batches
-        msg = f'Encoding {num} patterns into {(num-1)//batch_size + 1} batches...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for i in range(0, num, batch_size):
-            batch = images[i:i+batch_size]
-            batch_idx = i // batch_size
-            msg = f'  Encoding batch {batch_idx + 1}...'
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
-            
-            # Encode batch of 1-bit patterns
-            imagedata, size = encode(batch)
-            encodedimages.append(imagedata)
-            sizes.append(size)
-        
-        # Step 2: Define all pattern parameters
-        msg = f'Defining {num} patterns...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for i in range(0, num, batch_size):
-            batch_idx = i // batch_size
-            batch_len = min(batch_size, num - i)
+        num_batches = (num - 1) // batch_size + 1
+
+        # Step 1: Define all pattern parameters
+        report(f'Defining {num} patterns...')
+        # The DLPC900 keeps its last error code until it is read, so check
+        # once after all definitions instead of after every pattern
+        self._defer_errors = True
+        try:
+            for i in range(0, num, batch_size):
+                batch_idx = i // batch_size
+                batch_len = min(batch_size, num - i)
             
-            for j in range(batch_len):
-                pattern_idx = i + j
-                self.definepattern(
-                    pattern_idx,         # Global pattern index
-                    exp[pattern_idx],    # Exposure time
-                    1,                   # 1-bit depth
-                    '111',               # RGB color (white)
-                    ti[pattern_idx],     # Trigger in
-                    dt[pattern_idx],     # Dark time
-                    to[pattern_idx],     # Trigger out
-                    batch_idx,           # Batch index
-                    j                    # Pattern index within batch
-                )
+                for j in range(batch_len):
+                    pattern_idx = i + j
+                    self.definepattern(
+                        pattern_idx,         # Global pattern index
+                        exp[pattern_idx],    # Exposure time
+                        1,                   # 1-bit depth
+                        '111',               # RGB color (white)
+                        ti[pattern_idx],     # Trigger in
+                        dt[pattern_idx],     # Dark time
+                        to[pattern_idx],     # Trigger out
+                        batch_idx,           # Batch index
+                        j                    # Pattern index within batch
+                    )
+        finally:
+            self._defer_errors = False
+        self.checkforerrors()
         
-        # Step 3: Configure LUT
+        # Step 2: Configure LUT
         self.configurelut(num, rep)
         
-        # Step 4: Upload images in reverse order (required by DLPC900)
-        num_batches = len(encodedimages)
-        msg = f'Uploading {num_batches} batches in reverse order...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for idx, batch_idx in enumerate(reversed(range(num_batches))):
-            msg = f'  Batch {batch_idx} ({idx+1}/{num_batches})...'
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
-            self.setbmp(batch_idx, sizes[batch_idx])
-            self.bmpload(encodedimages[batch_idx], sizes[batch_idx], 
-                        progress_msg=f"Batch {batch_idx}: ",
-                        progress_callback=progress_callback)
+        # Step 3: Encode and upload images in reverse order (required by DLPC900)
+        # Batches are encoded in the background in upload order (see
+        # _encode_ahead), so the next batch is compressed while the
+        # current one is sent over USB
+        batch_order = list(reversed(range(num_batches)))
+        report(f'Encoding and uploading {num} patterns in {num_batches} batches in reverse order...')
+        encoded = self._encode_ahead(encode, [images[batch_idx*batch_size:(batch_idx+1)*batch_size]
+                                              for batch_idx in batch_order])
+        # setbmp errors show up in bmpload's per-packet error checks
+        self._defer_errors = True
+        try:
+            for idx, (batch_idx, (imagedata, size)) in enumerate(zip(batch_order, encoded)):
+                report(f'  Batch {batch_idx} ({idx+1}/{num_batches})...')
+                self.setbmp(batch_idx, size)
+                self.bmpload(imagedata, size, 
+                            progress_msg=f"Batch {batch_idx}: ",
+                            progress_callback=progress_callback)
+                # Release the uploaded image before waiting for the next one
+                del imagedata
+        finally:
+            self._defer_errors = False
+            encoded.close()
 
 
     def defsequence_8bit(self, images, exp, ti, dt, to, rep, progress_callback=None):
@@ -475,8 +450,9 @@ class dmd():
             raise ValueError(f"Maximum number of 8-bit patterns ({max_patterns}) exceeded")
         if not all(len(lst) == len(images) for lst in [exp, ti, dt, to]):
             raise ValueError("All input lists must have the same length as images list")
+        exp, ti, dt, to = _pattern_settings(exp, ti, dt, to)
         
-        import time
+        report = progress_callback or print
         
         # Required sequence for mode change (per DLPC900 reference implementations):
         # Stop → Set Pattern OTF mode → Stop again
@@ -493,70 +469,54 @@ class dmd():
         time.sleep(0.05)
         
         num = len(images)
-        encodedimages = []
-        sizes = []
 
-        # Step 1: Encode all 8-bit patterns
-        msg = f'Encoding {num} 8-bit patterns...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for i in range(num):
-            msg = f'  Encoding 8-bit pattern {i+1}/{num}...'
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
-            
-            # Encode the 8-bit pattern
-            imagedata, size = encode_8bit([images[i]])
-            encodedimages.append(imagedata)
-            sizes.append(size)
-        
-        # Step 2: Define all pattern parameters
-        msg = f'Defining {num} 8-bit patterns...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for i in range(num):
-            # Define pattern with 8-bit depth
-            # patind = i (each image gets its own index)
-            # bitpos = 0 (for 8-bit mode, DMD handles bit planes internally)
-            self.definepattern(
-                i,             # Pattern index
-                exp[i],        # Exposure time
-                8,             # 8-bit depth
-                '111',         # RGB color (white)
-                ti[i],         # Trigger in
-                dt[i],         # Dark time
-                to[i],         # Trigger out
-                i,             # Pattern set index (one per pattern for 8-bit)
-                0              # Bit position (0 for 8-bit)
-            )
+        # Step 1: Define all pattern parameters
+        report(f'Defining {num} 8-bit patterns...')
+        # The DLPC900 keeps its last error code until it is read, so check
+        # once after all definitions instead of after every pattern
+        self._defer_errors = True
+        try:
+            for i in range(num):
+                # Define pattern with 8-bit depth
+                # patind = i (each image gets its own index)
+                # bitpos = 0 (for 8-bit mode, DMD handles bit planes internally)
+                self.definepattern(
+                    i,             # Pattern index
+                    exp[i],        # Exposure time
+                    8,             # 8-bit depth
+                    '111',         # RGB color (white)
+                    ti[i],         # Trigger in
+                    dt[i],         # Dark time
+                    to[i],         # Trigger out
+                    i,             # Pattern set index (one per pattern for 8-bit)
+                    0              # Bit position (0 for 8-bit)
+                )
+        finally:
+            self._defer_errors = False
+        self.checkforerrors()
         
-        # Step 3: Configure LUT
+        # Step 2: Configure LUT
         self.configurelut(num, rep)
         
-        # Step 4: Upload images in reverse order (required by DLPC900)
-        msg = f'Uploading {num} 8-bit patterns in reverse order...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        msg = f'  Note: 8-bit uploads are large and may take several minutes...'
-        if progress_callback:
-            progress_callback(msg)
-        else:
-            print(msg)
-        for idx, i in enumerate(reversed(range(num))):
-            msg = f'  Pattern {i} ({idx+1}/{num}) - {sizes[i]} bytes...'
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
-            self.setbmp(i, sizes[i])
-            self.bmpload(encodedimages[i], sizes[i], 
-                        progress_msg=f"Pattern {i}: ",
-                        progress_callback=progress_callback)
+        # Step 3: Encode and upload images in reverse order (required by DLPC900)
+        # Patterns are encoded in the background in upload order (see
+        # _encode_ahead), so the next pattern is compressed while the
+        # current one is sent over USB
+        pattern_order = list(reversed(range(num)))
+        report(f'Encoding and uploading {num} 8-bit patterns in reverse order...')
+        report(f'  Note: 8-bit uploads are large and may take several minutes...')
+        encoded = self._encode_ahead(encode_8bit, [[images[i]] for i in pattern_order])
+        # setbmp errors show up in bmpload's per-packet error checks
+        self._defer_errors = True
+        try:
+            for idx, (i, (imagedata, size)) in enumerate(zip(pattern_order, encoded)):
+                report(f'  Pattern {i} ({idx+1}/{num}) - {size} bytes...')
+                self.setbmp(i, size)
+                self.bmpload(imagedata, size, 
+                            progress_msg=f"Pattern {i}: ",
+                            progress_callback=progress_callback)
+                # Release the uploaded image before waiting for the next one
+                del imagedata
+        finally:
+            self._defer_errors = False
+            encoded.close()